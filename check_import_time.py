@@ -0,0 +1,109 @@
+import argparse
+import os
+import subprocess
+import sys
+
+
+# Entry-point modules that workers and utility commands import at startup
+DEFAULT_MODULES = [
+    "main",
+    "export_table_to_excel",
+    "query_opgs",
+    "migrate",
+    "remeasure",
+    "modules.logger_setup",
+    "modules.insert_opg_record",
+    "modules.parse_filename",
+    "modules.load_yolo_polygons",
+]
+
+# Packages that must only be loaded on first use, never at import time
+HEAVY_MODULES = ["PIL", "numpy", "psycopg2", "dotenv", "cv2", "sqlite3"]
+
+
+# ------------------------------
+# Measure a single import in a fresh interpreter
+# ------------------------------
+def measure_import(module: str):
+    """Return (cumulative_ms, heavy_modules_loaded, side_effects) for `import module`."""
+    probe = (
+        "import logging, os, sys\n"
+        "before = os.path.exists('logs')\n"
+        f"import {module}\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "effects = []\n"
+        "if not before and os.path.exists('logs'):\n"
+        "    effects.append('created logs/')\n"
+        "if logging.getLogger('tooth_logger').handlers:\n"
+        "    effects.append('attached log handlers')\n"
+        "print('|'.join([','.join(heavy), ','.join(effects)]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    # -X importtime lines look like: "import time:   self [us] | cumulative | name"
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative_us = int(parts[1])
+    if cumulative_us is None:
+        raise RuntimeError(f"No import time reported for {module}")
+
+    heavy, effects = result.stdout.strip().splitlines()[-1].split("|")
+    return (
+        cumulative_us / 1000.0,
+        [m for m in heavy.split(",") if m],
+        [e for e in effects.split(",") if e],
+    )
+
+
+# ------------------------------
+# Entry point
+# ------------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that entry-point modules import quickly and without side effects."
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        default=DEFAULT_MODULES,
+        help="Modules to check (default: all entry points)",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=50.0,
+        help="Maximum cumulative import time per module in milliseconds (default: 50)",
+    )
+    args = parser.parse_args()
+
+    failures = 0
+    for module in args.modules:
+        elapsed_ms, heavy, effects = measure_import(module)
+        problems = []
+        if elapsed_ms > args.budget_ms:
+            problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+        if heavy:
+            problems.append(f"loads {', '.join(heavy)}")
+        problems.extend(effects)
+
+        status = "FAIL" if problems else "ok"
+        detail = f" - {'; '.join(problems)}" if problems else ""
+        print(f"{status:4} {module:35} {elapsed_ms:8.2f} ms{detail}")
+        failures += bool(problems)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,21 @@ import argparse
 import base64
 import datetime
 from decimal import Decimal
+from html import escape
 from io import BytesIO
 import os
 from pathlib import Path
 import re
 import zipfile
 
-from psycopg2 import sql
-from xml.sax.saxutils import escape
-
-from modules.insert_opg_record import get_connection
+from modules.storage import get_backend
 
 
 # ------------------------------
 # Fetch all rows from a table
 # ------------------------------
 def fetch_table_data(table_name: str):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(sql.SQL("SELECT * FROM {}").format(sql.Identifier(table_name)))
-    rows = cur.fetchall()
-    columns = [desc[0] for desc in cur.description]
-    cur.close()
-    conn.close()
-    return columns, rows
+    return get_backend().fetch_table(table_name)
 
 
 # ------------------------------
@@ -185,7 +176,7 @@ def write_xlsx(path: Path, sheets):
 # ------------------------------
 def main():
     parser = argparse.ArgumentParser(
-        description="Export a PostgreSQL table to an Excel .xlsx file without extra dependencies."
+        description="Export a database table (PostgreSQL or SQLite backend) to an Excel .xlsx file without extra dependencies."
     )
     parser.add_argument(
         "--table",
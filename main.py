@@ -1,94 +1,174 @@
-# Image processing modules
-from PIL import Image
+import argparse
 import os
+import time
 
-# Modules
-from modules.logger_setup import logger
+# Modules (light-weight; PIL, NumPy and psycopg2 are imported on first use)
+from modules.logger_setup import logger, setup_logging
 from modules.parse_filename import parse_filename
-from modules.load_yolo_polygons import load_yolo_polygons
-from modules.measure_polygon_length import measure_polygon_length
-from modules.measure_canine_distance import get_peak_point, measure_canine_distance
-from modules.insert_opg_record import insert_opg_record
-from modules.visualize_measurements import visualize_measurements
+
+# Number of OPGs upserted per database transaction during batch processing
+INSERT_BATCH_SIZE = 25
 
 
 # ------------------------------
 # PROCESS A SINGLE IMAGE + LABEL
 # ------------------------------
-def process_opg(image_path, label_path):
+def process_opg(image_path, label_path, class_map=None):
+    # Read raw files
+    with open(image_path, "rb") as f:
+        img_bytes = f.read() # Read the bytes of the image
+
+    with open(label_path, "r") as f:
+        label_txt = f.read() # Read the text of the label
+
+    process_opg_data(image_path, img_bytes, label_txt, class_map)
+
+
+def process_opg_data(image_name, img_bytes, label_txt, class_map=None, batch=None):
+    '''
+    Measures and stores one OPG given its file name, image bytes and label text (no disk reads).
+    When a batch list is given the record is appended to it instead of being written right away.
+    '''
+    # Heavy imports are deferred so importing main stays cheap for workers
+    from io import BytesIO
+    from PIL import Image
+    from modules.load_yolo_polygons import parse_yolo_polygons
+    from modules.measure_opg import measure_opg, measurement_values, packed_measurements
+    from modules.tooth_config import load_class_map
+    from modules.insert_opg_record import insert_opg_records, opg_record
+    from modules.visualize_measurements import visualize_measurements
+
     try:
-        title, age, sex = parse_filename(image_path)
+        title, age, sex = parse_filename(image_name)
     except Exception as e:
         logger.error(str(e))
         return
 
-    # Open image to get real resolution
-    img = Image.open(image_path)
+    # Open image to get real resolution (only the header is decoded)
+    img = Image.open(BytesIO(img_bytes))
     image_width, image_height = img.size
-    
-    # Get the scale of each pixel for the standard image size of 270 mm
-    mm_per_pixel = 270 / image_width
 
     logger.info(f"\n🖼  Processing {title}")
     logger.info(f"   → Resolution: {image_width} × {image_height}")
-    logger.info(f"   → Pixel Scale: {mm_per_pixel} mm")
 
     # Load polygon data
-    polygons = load_yolo_polygons(label_path)
-
-    # Measure tooth lengths
-    lengths = {}
-    peaks = {}
-    for t in ["13", "23", "33", "43"]: # Loop through each type of tooth
-        if polygons[t]:
-            lengths[t] = measure_polygon_length(
-                polygons[t], image_width, image_height, mm_per_pixel
-            )
-            peaks[t] = get_peak_point(
-                polygons[t], image_width, image_height, t
-            )
-        else: # If there is no such tooth, set as None
-            lengths[t] = None 
-            peaks[t] = None 
-
-    # Call the module function to calculate the canine distances
-    distance_13_23, distance_33_43 = measure_canine_distance(peaks, mm_per_pixel)
+    polygons = parse_yolo_polygons(label_txt.splitlines(), image_name, class_map or load_class_map())
+
+    # Measure tooth lengths and the peak distance matrix
+    measurements = measure_opg(polygons, image_width, image_height)
+    logger.info(f"   → Pixel Scale: {measurements['mm_per_pixel']} mm")
 
     # Save visualization of measured lines
     visualize_measurements(
-        image_path=image_path,
+        image_path=image_name,
         polygons=polygons,
-        peaks=peaks,
+        peaks=measurements["peaks"],
         output_dir=os.path.join("exports", "visualizations"),
+        image_bytes=img_bytes,
     )
 
-    # Read raw files
-    with open(image_path, "rb") as f:
-        img_bytes = f.read() # Read the bytes of the image
-
-    with open(label_path, "r") as f:
-        label_txt = f.read() # Read the text of the label
+    tooth_set, tooth_lengths, peak_distances = packed_measurements(measurements)
 
-    # UPSERT into database
-    insert_opg_record(
+    # Canine columns the tooth set doesn't cover are left out, so they are never overwritten with NULL
+    record = opg_record(
         title, age, sex,
-        float(lengths["13"]) if lengths["13"] is not None else None,
-        float(lengths["23"]) if lengths["23"] is not None else None,
-        float(lengths["33"]) if lengths["33"] is not None else None,
-        float(lengths["43"]) if lengths["43"] is not None else None,
-        float(distance_13_23) if distance_13_23 is not None else None,
-        float(distance_33_43) if distance_33_43 is not None else None,
         img_bytes, label_txt,
+        image_width=image_width,
+        image_height=image_height,
+        tooth_set=tooth_set,
+        tooth_lengths=tooth_lengths,
+        peak_distances=peak_distances,
+        **measurement_values(measurements),
     )
 
+    if batch is not None:
+        batch.append(record)
+        logger.info(f"✔ Measured | Age: {age}")
+        return
+
+    # UPSERT into database
+    insert_opg_records([record])
     logger.info(f"✔ Stored in DB | Age: {age}")
 
 
 
+# -------------------------------------------
+# PROCESS (IMAGE, LABEL) PAIRS IN BATCHES
+# -------------------------------------------
+def _flush(batch):
+    from modules.insert_opg_record import insert_opg_records
+
+    if batch:
+        insert_opg_records(batch) # One transaction per batch
+        logger.info(f"💾 Stored {len(batch)} OPGs in DB")
+        batch.clear()
+
+
+def _process_pairs(pairs, class_map):
+    logger.info("🚀 Starting batch processing...\n")
+
+    start = time.perf_counter()
+    processed = 0
+    failed = 0
+    batch = []
+    try:
+        for image_name, img_bytes, label_txt in pairs:
+            if label_txt is None:
+                logger.warning(f"❌ Missing label for {os.path.basename(image_name)}, skipping.")
+                continue
+
+            # One bad image (corrupt file, malformed label) must not cost the measured batch
+            try:
+                process_opg_data(image_name, img_bytes, label_txt, class_map, batch)
+            except Exception as e:
+                failed += 1
+                logger.error(f"❌ Could not process {os.path.basename(image_name)}: {e}")
+                continue
+            processed += 1
+            if len(batch) >= INSERT_BATCH_SIZE:
+                _flush(batch)
+    finally:
+        _flush(batch) # Store what was measured even if reading the source fails midway
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"⏱  {processed} OPGs in {elapsed:.1f} s ({processed / elapsed if elapsed else 0:.1f} OPG/s)")
+    if failed:
+        logger.warning(f"\n⚠ DONE with {failed} OPG files that could not be processed (see errors above).\n")
+    else:
+        logger.info("\n🎉 DONE! All OPG files processed successfully.\n")
+
+
+
+# -------------------------------------------
+# PROCESS ALL FILES IN A ZIP/TAR ARCHIVE
+# -------------------------------------------
+def process_archive(archive_path, subset=None, class_map=None):
+    from modules.dataset_archive import iter_archive_pairs
+    from modules.tooth_config import load_class_map
+
+    _process_pairs(iter_archive_pairs(archive_path, subset), class_map or load_class_map())
+
+
+
 # -------------------------------------------
 # PROCESS ALL FILES IN FOLDERS
 # -------------------------------------------
-def process_all(base_dir):
+def process_all(base_dir, subset=None, class_map=None):
+    '''
+    base_dir is a folder with images/ and labels/, or a zip/tar export streamed without extracting.
+    subset picks one split (e.g. "train"): a sub-folder of base_dir, or a split inside the archive.
+    '''
+    from modules.dataset_archive import is_archive
+    from modules.tooth_config import load_class_map
+
+    class_map = class_map or load_class_map() # Resolve the tooth set once for the whole batch
+
+    if is_archive(base_dir):
+        return process_archive(base_dir, subset, class_map)
+
+    if subset is not None:
+        base_dir = os.path.join(base_dir, subset)
+
     img_dir = os.path.join(base_dir, "images")   # Create image folder path
     label_dir = os.path.join(base_dir, "labels") # Create label folder path
 
@@ -98,25 +178,56 @@ def process_all(base_dir):
     ])
 
     logger.info(f"\n📁 Found {len(images)} OPG images.")
-    logger.info("🚀 Starting batch processing...\n")
 
-    for img_file in images:                                 # Loop through each image file
-        img_path = os.path.join(img_dir, img_file)          # Get the path of each image
-        base = os.path.splitext(img_file)[0]                # Get he name of the file without the extension
-        label_path = os.path.join(label_dir, base + ".txt") # Use the base name to get the label path
+    def folder_pairs():
+        for img_file in images:                                 # Loop through each image file
+            img_path = os.path.join(img_dir, img_file)          # Get the path of each image
+            base = os.path.splitext(img_file)[0]                # Get he name of the file without the extension
+            label_path = os.path.join(label_dir, base + ".txt") # Use the base name to get the label path
 
-        if not os.path.exists(label_path):
-            logger.warning(f"❌ Missing label for {img_file}, skipping.")
-            continue
+            if not os.path.exists(label_path):
+                yield img_path, None, None
+                continue
 
-        process_opg(img_path, label_path)
+            with open(img_path, "rb") as f:
+                img_bytes = f.read() # Read the bytes of the image
+            with open(label_path, "r") as f:
+                label_txt = f.read() # Read the text of the label
+            yield img_path, img_bytes, label_txt
 
-    logger.info("\n🎉 DONE! All OPG files processed successfully.\n")
+    _process_pairs(folder_pairs(), class_map)
 
 
 
 # -------------------------------------------
 # RUN
 # -------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure OPG labels and store them (with the images) in the database."
+    )
+    parser.add_argument(
+        "source",
+        nargs="?",
+        default=os.path.join("datasets", "main-opgs-final-version", "train"),
+        help="Folder with images/ and labels/, or a .zip/.tar(.gz) dataset export "
+             "(default: datasets/main-opgs-final-version/train)",
+    )
+    parser.add_argument(
+        "--subset",
+        help="Split to process, e.g. train: a sub-folder of SOURCE or a split inside the archive",
+    )
+    parser.add_argument(
+        "--class-map",
+        help="JSON file mapping YOLO class ids to FDI teeth (default: TOOTH_CLASS_MAP or the four canines)",
+    )
+    args = parser.parse_args()
+
+    from modules.tooth_config import load_class_map
+
+    setup_logging()
+    process_all(args.source, subset=args.subset, class_map=load_class_map(args.class_map))
+
+
 if __name__ == "__main__":
-    process_all("datasets\\main-opgs-final-version\\train")
+    main()
@@ -0,0 +1,18 @@
+from modules.logger_setup import setup_logging
+from modules.migrations import apply_migrations
+
+
+# ------------------------------
+# Entry point
+# ------------------------------
+def main():
+    setup_logging(mode="a")
+    applied = apply_migrations()
+    if applied:
+        print(f"Applied {len(applied)} migration(s): {', '.join(applied)}")
+    else:
+        print("Database schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
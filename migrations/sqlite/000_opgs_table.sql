@@ -0,0 +1,17 @@
+-- Base OPGs table for the embedded backend. On PostgreSQL the table predates
+-- the migrations; here it is created by the first one, with the same columns.
+
+CREATE TABLE IF NOT EXISTS OPGs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL UNIQUE,
+    sex TEXT,
+    age INTEGER,
+    canine_13_length REAL,
+    canine_23_length REAL,
+    canine_33_length REAL,
+    canine_43_length REAL,
+    distance_13_23 REAL,
+    distance_33_43 REAL,
+    opg_image BLOB,
+    label_text TEXT
+);
@@ -0,0 +1,13 @@
+-- Indexes for the measurement query API (modules/query_measurements.py).
+-- Filters on sex/age and on measurement ranges are answered from these
+-- b-trees instead of scanning OPGs and its image blobs; id is the keyset
+-- pagination cursor and is already covered by the primary key.
+
+CREATE INDEX IF NOT EXISTS opgs_sex_age_idx ON OPGs (sex, age);
+
+CREATE INDEX IF NOT EXISTS opgs_canine_13_length_idx ON OPGs (canine_13_length);
+CREATE INDEX IF NOT EXISTS opgs_canine_23_length_idx ON OPGs (canine_23_length);
+CREATE INDEX IF NOT EXISTS opgs_canine_33_length_idx ON OPGs (canine_33_length);
+CREATE INDEX IF NOT EXISTS opgs_canine_43_length_idx ON OPGs (canine_43_length);
+CREATE INDEX IF NOT EXISTS opgs_distance_13_23_idx ON OPGs (distance_13_23);
+CREATE INDEX IF NOT EXISTS opgs_distance_33_43_idx ON OPGs (distance_33_43);
@@ -0,0 +1,6 @@
+-- Store the image resolution next to the label so measurements can be
+-- recomputed from label_text alone (remeasure.py) without reading opg_image.
+-- Existing rows are filled in by `python remeasure.py --backfill-dimensions`.
+
+ALTER TABLE OPGs ADD COLUMN image_width INTEGER;
+ALTER TABLE OPGs ADD COLUMN image_height INTEGER;
@@ -0,0 +1,9 @@
+-- Per-tooth lengths and the pairwise peak distance matrix for the configured
+-- tooth set (modules/tooth_config.py). Stored compactly as little-endian
+-- float32 arrays (NaN = tooth not found): tooth_lengths holds one value per
+-- tooth in tooth_set order, peak_distances the upper triangle of the matrix
+-- row by row. Decode with measure_teeth.unpack_measurements().
+
+ALTER TABLE OPGs ADD COLUMN tooth_set TEXT;
+ALTER TABLE OPGs ADD COLUMN tooth_lengths BLOB;
+ALTER TABLE OPGs ADD COLUMN peak_distances BLOB;
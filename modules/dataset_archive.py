@@ -0,0 +1,134 @@
+import os
+import posixpath
+import tarfile
+import zipfile
+
+from modules.logger_setup import logger
+
+IMAGE_EXTENSIONS = (".jpg", ".png", ".jpeg")
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def is_archive(path):
+    '''Returns True if path is a zip/tar file we can stream samples from'''
+    return os.path.isfile(path) and str(path).lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def _member_key(name, folder, subset):
+    """
+    Map 'train/images/x.jpg' to the key ('train', 'x') for folder='images'.
+
+    Images and labels are paired when their keys match, i.e. same base name
+    under the same split. Returns None for members outside `folder` or outside
+    the requested subset (split name such as 'train').
+    """
+    parts = name.replace("\\", "/").split("/")
+    if len(parts) < 2 or parts[-2] != folder:
+        return None
+    prefix = "/".join(parts[:-2])
+    if subset is not None and posixpath.basename(prefix) != subset:
+        return None
+    return prefix, os.path.splitext(parts[-1])[0]
+
+
+def _is_image(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+# -------------------------------------------
+# ZIP: PAIR MEMBERS FROM THE CENTRAL DIRECTORY
+# -------------------------------------------
+def _iter_zip_pairs(archive_path, subset):
+    with zipfile.ZipFile(archive_path) as zf:
+        images = []
+        labels = {}
+        for info in zf.infolist(): # Central directory only, nothing is decompressed here
+            if info.is_dir():
+                continue
+            if _is_image(info.filename):
+                key = _member_key(info.filename, "images", subset)
+                if key is not None:
+                    images.append((info.filename, key))
+            elif info.filename.endswith(".txt"):
+                key = _member_key(info.filename, "labels", subset)
+                if key is not None:
+                    labels[key] = info.filename
+
+        images.sort()
+        logger.info(f"\n📦 Found {len(images)} OPG images in {archive_path}.")
+
+        for image_name, key in images:
+            label_name = labels.get(key)
+            if label_name is None:
+                yield image_name, None, None # Unlabelled images are never decompressed
+                continue
+            yield image_name, zf.read(image_name), zf.read(label_name).decode("utf-8")
+
+
+# -------------------------------------------
+# TAR: ONE SEQUENTIAL PASS (+ CATCH-UP PASS IF NEEDED)
+# -------------------------------------------
+def _iter_tar_pairs(archive_path, subset):
+    # Streaming mode ("r|*") never seeks backwards, so compressed tars are
+    # decompressed linearly. Tars have no central index: an image is yielded
+    # as soon as it is reached if its label came earlier in the archive
+    # (labels-first ordering, e.g. `tar czf ds.tgz */labels */images`).
+    # Images that precede their label are only remembered by name and read in
+    # a second pass, which is skipped entirely when the ordering is labels-first.
+    labels = {}
+    deferred = {}
+    image_count = 0
+    with tarfile.open(archive_path, "r|*") as tf:
+        for member in tf:
+            if not member.isfile():
+                continue
+            if _is_image(member.name):
+                key = _member_key(member.name, "images", subset)
+                if key is None:
+                    continue
+                image_count += 1
+                if key in labels:
+                    yield member.name, tf.extractfile(member).read(), labels[key]
+                else:
+                    deferred[member.name] = key
+            elif member.name.endswith(".txt"):
+                key = _member_key(member.name, "labels", subset)
+                if key is not None:
+                    labels[key] = tf.extractfile(member).read().decode("utf-8")
+
+    logger.info(f"\n📦 Found {image_count} OPG images in {archive_path}.")
+
+    for name, key in list(deferred.items()):
+        if key not in labels:
+            del deferred[name]
+            yield name, None, None # Unlabelled images are never read
+
+    if not deferred:
+        return
+    logger.warning(
+        f"{len(deferred)} images in {archive_path} come before their labels; "
+        "reading the archive a second time (store labels first to avoid this)."
+    )
+    with tarfile.open(archive_path, "r|*") as tf:
+        for member in tf:
+            key = deferred.get(member.name)
+            if key is not None and member.isfile():
+                yield member.name, tf.extractfile(member).read(), labels[key]
+
+
+# -------------------------------------------
+# ITERATE (IMAGE, LABEL) PAIRS FROM AN ARCHIVE
+# -------------------------------------------
+def iter_archive_pairs(archive_path, subset=None):
+    """
+    Yield (image_name, image_bytes, label_text) for every image in a
+    Roboflow-style export (<split>/images/*.jpg + <split>/labels/*.txt)
+    without extracting anything to disk. image_bytes and label_text are None
+    when the image has no matching label. `subset` restricts to one split,
+    e.g. 'train'.
+    """
+    if zipfile.is_zipfile(archive_path):
+        return _iter_zip_pairs(archive_path, subset)
+    if tarfile.is_tarfile(archive_path):
+        return _iter_tar_pairs(archive_path, subset)
+    raise ValueError(f"Unsupported dataset archive: {archive_path}")
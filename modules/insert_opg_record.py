@@ -1,59 +1,52 @@
-import psycopg2
-import os
-from dotenv import load_dotenv
+from modules.storage import OPG_COLUMNS, get_backend, load_config  # noqa: F401 (load_config re-exported)
 
-load_dotenv() # Load the environmental variables 
 
 # -------------------------------------------
 # DB CONNECTION
 # -------------------------------------------
 def get_connection():
-    return psycopg2.connect(
-        dbname = os.getenv("DB_NAME"),
-        user = os.getenv("DB_USER"),
-        password = os.getenv("DB_PASSWORD"),
-        host = os.getenv("DB_HOST"),
-        port = os.getenv("DB_PORT"),
-    )
+    '''DB-API connection to the configured storage backend (see modules.storage)'''
+    return get_backend().connect()
+
+
+# -------------------------------------------
+# BUILD ONE RECORD ({column: value} FOR storage.OPG_COLUMNS)
+# -------------------------------------------
+def opg_record(title, age, sex, img_bytes, label_text, **columns):
+    '''
+    Record for insert_opg_records(). Only the given measurement columns are written on upsert,
+    so a tooth set without some canines leaves their stored values alone.
+    '''
+    unknown = sorted(set(columns) - set(OPG_COLUMNS))
+    if unknown:
+        raise ValueError(f"Unknown OPGs column(s): {', '.join(unknown)}")
+    return {
+        "title": title, "sex": sex, "age": age,
+        "opg_image": img_bytes, "label_text": label_text,
+        **columns,
+    }
+
 
 # -------------------------------------------
-# INSERT OR UPDATE DATABASE RECORD (UPSERT)
+# INSERT OR UPDATE DATABASE RECORDS (UPSERT)
 # -------------------------------------------
+def insert_opg_records(records):
+    '''Upserts a batch of opg_record() dicts on title, in a single transaction'''
+    get_backend().upsert_opg_records(records)
+
+
 def insert_opg_record(title, age, sex,
-                      l13, l23, l33, l43, 
-                      dist_13_23, dist_33_43, 
-                      img_bytes, label_text):
-
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("""
-        INSERT INTO OPGs (
-            title, sex, age,
-            canine_13_length, canine_23_length,
-            canine_33_length, canine_43_length,
-            distance_13_23, distance_33_43,
-            opg_image, label_text
-        )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        ON CONFLICT (title) DO UPDATE SET
-            sex = EXCLUDED.sex,
-            age = EXCLUDED.age,
-            canine_13_length = EXCLUDED.canine_13_length,
-            canine_23_length = EXCLUDED.canine_23_length,
-            canine_33_length = EXCLUDED.canine_33_length,
-            canine_43_length = EXCLUDED.canine_43_length,
-            distance_13_23 = EXCLUDED.distance_13_23,
-            distance_33_43 = EXCLUDED.distance_33_43,
-            opg_image = EXCLUDED.opg_image,
-            label_text = EXCLUDED.label_text;
-    """, (
-        title, sex, age,
-        l13, l23, l33, l43,
-        dist_13_23, dist_33_43,
-        img_bytes, label_text
-    ))
-
-    conn.commit()
-    cur.close()
-    conn.close()
+                      l13, l23, l33, l43,
+                      dist_13_23, dist_33_43,
+                      img_bytes, label_text,
+                      image_width=None, image_height=None,
+                      tooth_set=None, tooth_lengths=None, peak_distances=None):
+
+    insert_opg_records([opg_record(
+        title, age, sex, img_bytes, label_text,
+        canine_13_length=l13, canine_23_length=l23,
+        canine_33_length=l33, canine_43_length=l43,
+        distance_13_23=dist_13_23, distance_33_43=dist_33_43,
+        image_width=image_width, image_height=image_height,
+        tooth_set=tooth_set, tooth_lengths=tooth_lengths, peak_distances=peak_distances,
+    )])
@@ -2,40 +2,65 @@ import logging
 import os
 import sys
 
-# Ensure console supports UTF-8 (fixes emoji errors on Windows)
-try:
-    sys.stdout.reconfigure(encoding="utf-8")
-except AttributeError:
-    # Older Python versions
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
-
-# Create logs directory if it doesn't exist
-os.makedirs("logs", exist_ok=True)
-
 # -------------------------------------------
-# CONFIGURE LOGGER
+# LOGGER
 # -------------------------------------------
+# Importing this module only creates the named logger. Handlers, the logs/
+# directory and the UTF-8 console are set up by setup_logging(), which entry
+# points call once; workers and small utilities can skip it or log to their
+# own file instead of truncating the shared one.
 logger = logging.getLogger("tooth_logger")
 logger.setLevel(logging.DEBUG)
 
+DEFAULT_LOG_FILE = os.path.join("logs", "app.log")
+
 # Log format
-formatter = logging.Formatter(
-    "%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
-
-# -------- Console Handler (UTF-8 safe) --------
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(formatter)
-
-# -------- File Handler (UTF-8 safe) --------
-file_handler = logging.FileHandler("logs/app.log", mode="w", encoding="utf-8")
-file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(formatter)
-
-# Only add handlers once
-if not logger.handlers:
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+LOG_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _ensure_utf8_stdout():
+    # Ensure console supports UTF-8 (fixes emoji errors on Windows)
+    try:
+        sys.stdout.reconfigure(encoding="utf-8")
+    except AttributeError:
+        # Older Python versions
+        import io
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+
+# -------------------------------------------
+# CONFIGURE LOGGER
+# -------------------------------------------
+def setup_logging(log_file=DEFAULT_LOG_FILE, mode="w", console=True):
+    """
+    Attach console/file handlers to the tooth logger (only once per process).
+
+    Pass log_file=None to skip the file handler, or mode="a" when several
+    processes share the same file.
+    """
+    if logger.handlers:
+        return logger
+
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFMT)
+
+    # -------- Console Handler (UTF-8 safe) --------
+    if console:
+        _ensure_utf8_stdout()
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
+
+    # -------- File Handler (UTF-8 safe) --------
+    if log_file:
+        # Create logs directory if it doesn't exist
+        log_dir = os.path.dirname(log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.FileHandler(log_file, mode=mode, encoding="utf-8")
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+        logger.addHandler(file_handler)
+
+    return logger
@@ -0,0 +1,72 @@
+import numpy as np
+
+from modules.measure_teeth import measure_teeth, pack_measurements
+from modules.tooth_config import CANINE_COLUMNS, canine_columns
+
+# Standard physical width of an OPG image, used to get the scale of each pixel
+IMAGE_WIDTH_MM = 270
+
+
+def _to_float(value):
+    return None if value is None or np.isnan(value) else float(value)
+
+
+# -------------------------------------------
+# MEASURE ALL TEETH OF ONE OPG
+# -------------------------------------------
+def measure_opg(polygons, image_width, image_height):
+    """
+    Measure every tooth in `polygons` (as returned by parse_yolo_polygons,
+    keyed by FDI number in class-map order) for one image.
+
+    Returns the pixel scale, the tooth order, per-tooth lengths and peaks
+    (None when missing), the full peak distance matrix, and the canine
+    distances for the legacy columns.
+    """
+    # Get the scale of each pixel for the standard image size of 270 mm
+    mm_per_pixel = IMAGE_WIDTH_MM / image_width
+
+    teeth = list(polygons.keys())
+    lengths, peaks, distances = measure_teeth(
+        polygons, teeth, image_width, image_height, mm_per_pixel
+    )
+    index = {t: i for i, t in enumerate(teeth)}
+
+    measurements = {
+        "mm_per_pixel": mm_per_pixel,
+        "teeth": teeth,
+        "lengths": {t: _to_float(lengths[i]) for t, i in index.items()},
+        "peaks": {
+            t: None if np.isnan(peaks[i]).any() else (float(peaks[i, 0]), float(peaks[i, 1]))
+            for t, i in index.items()
+        },
+        "length_array": lengths,
+        "distance_matrix": distances,
+    }
+    for column in ("distance_13_23", "distance_33_43"):
+        a, b = CANINE_COLUMNS[column]
+        both = a in index and b in index
+        measurements[column] = _to_float(distances[index[a], index[b]]) if both else None
+    return measurements
+
+
+def measurement_values(measurements):
+    """
+    Return {column: float or None} for the legacy canine columns this tooth
+    set covers. Columns whose teeth are not in the set are left out, so
+    storing the values never overwrites them with NULL.
+    """
+    values = {}
+    for column in canine_columns(measurements["teeth"]):
+        if column.startswith("distance_"):
+            values[column] = measurements[column]
+        else:
+            values[column] = measurements["lengths"][CANINE_COLUMNS[column][0]]
+    return values
+
+
+def packed_measurements(measurements):
+    '''Returns (tooth_set, tooth_lengths, peak_distances) for the compact columns of OPGs'''
+    return pack_measurements(
+        measurements["teeth"], measurements["length_array"], measurements["distance_matrix"]
+    )
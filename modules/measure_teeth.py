@@ -0,0 +1,114 @@
+import numpy as np
+
+from modules.tooth_config import is_maxillary
+
+# Compact on-disk encoding: little-endian float32, NaN = tooth not found
+_STORED_DTYPE = np.dtype("<f4")
+
+
+def _stack_polygons(polygons, image_width, image_height):
+    '''Returns an (n_polygons, max_points, 2) pixel array, padded with NaN'''
+    max_points = max((len(points or ()) for points in polygons), default=0)
+    pts = np.full((len(polygons), max(max_points, 1), 2), np.nan)
+    for i, points in enumerate(polygons):
+        if points:
+            pts[i, :len(points)] = points
+    pts *= (image_width, image_height) # Convert normalized YOLO coords → pixel coords
+    return pts
+
+
+def _extreme_centers(px, py, valid, want_max, eps):
+    '''(x, y) of the top- or bottom-most edge of every polygon, using the center of that edge'''
+    if want_max:
+        target = np.max(np.where(valid, py, -np.inf), axis=1)
+        mask = valid & (py >= (target - eps)[:, None])
+    else:
+        target = np.min(np.where(valid, py, np.inf), axis=1)
+        mask = valid & (py <= (target + eps)[:, None])
+
+    count = mask.sum(axis=1)
+    x = np.where(mask, px, 0.0).sum(axis=1) / np.maximum(count, 1)
+    x[count == 0] = np.nan
+    target[count == 0] = np.nan
+    return np.stack([x, target], axis=1)
+
+
+# -------------------------------------------
+# GEOMETRY SHARED BY MEASUREMENT AND VISUALIZATION
+# -------------------------------------------
+def polygon_extremes(polygons, image_width, image_height, eps=1.0):
+    """
+    Return (top, bottom): the highest and lowest points in pixels of each
+    polygon in the list (normalized YOLO points), each with shape (n, 2).
+    The center of the extreme edge is used to reduce bbox/flat-edge bias;
+    empty polygons give NaN.
+    """
+    pts = _stack_polygons(polygons, image_width, image_height)
+    px, py = pts[..., 0], pts[..., 1]
+    valid = ~np.isnan(py)
+
+    # Highest & lowest points vertically (the y axis is reversed in pictures)
+    top = _extreme_centers(px, py, valid, want_max=False, eps=eps)
+    bottom = _extreme_centers(px, py, valid, want_max=True, eps=eps)
+    return top, bottom
+
+
+def peak_distance_matrix(peaks, mm_per_pixel):
+    '''Pairwise distances in mm between (n, 2) pixel peaks; NaN rows/columns for missing teeth'''
+    diff = peaks[:, None, :] - peaks[None, :, :]
+    return np.hypot(diff[..., 0], diff[..., 1]) * mm_per_pixel
+
+
+# -------------------------------------------
+# MEASURE ALL TEETH IN ONE NUMPY PASS
+# -------------------------------------------
+def measure_teeth(polygons, teeth, image_width, image_height, mm_per_pixel, eps=1.0):
+    """
+    Measure every tooth in `teeth` (FDI numbers) at once.
+
+    Returns (lengths, peaks, distances): lengths in mm with shape (n,), peak
+    points in pixels with shape (n, 2) and the pairwise peak distance matrix
+    in mm with shape (n, n). Missing teeth are NaN.
+    """
+    top, bottom = polygon_extremes(
+        [polygons.get(t) for t in teeth], image_width, image_height, eps
+    )
+
+    lengths = np.hypot(bottom[:, 0] - top[:, 0], bottom[:, 1] - top[:, 1]) * mm_per_pixel
+
+    # Maxillary teeth peak at the bottom-most point, mandibular at the top-most
+    upper = np.array([is_maxillary(t) for t in teeth], dtype=bool)
+    peaks = np.where(upper[:, None], bottom, top)
+
+    return lengths, peaks, peak_distance_matrix(peaks, mm_per_pixel)
+
+
+# -------------------------------------------
+# COMPACT STORAGE OF LENGTHS + DISTANCE MATRIX
+# -------------------------------------------
+def pack_measurements(teeth, lengths, distances):
+    '''Returns (tooth_set, lengths_bytes, distances_bytes); only the upper triangle of the matrix is kept'''
+    upper = np.triu_indices(len(teeth), k=1)
+    return (
+        ",".join(teeth),
+        np.asarray(lengths, dtype=_STORED_DTYPE).tobytes(),
+        np.asarray(distances)[upper].astype(_STORED_DTYPE).tobytes(),
+    )
+
+
+def unpack_measurements(tooth_set, lengths_bytes, distances_bytes):
+    '''Inverse of pack_measurements: returns (teeth, lengths, square distance matrix)'''
+    if not tooth_set:
+        # Rows stored before migration 003 or never remeasured have NULL tooth columns
+        return [], np.empty(0), np.empty((0, 0))
+
+    teeth = tooth_set.split(",")
+    n = len(teeth)
+    lengths = np.frombuffer(bytes(lengths_bytes), dtype=_STORED_DTYPE).astype(float)
+
+    distances = np.full((n, n), np.nan)
+    upper = np.triu_indices(n, k=1)
+    distances[upper] = np.frombuffer(bytes(distances_bytes), dtype=_STORED_DTYPE)
+    distances.T[upper] = distances[upper]
+    distances[np.diag_indices(n)] = np.where(np.isnan(lengths), np.nan, 0.0)
+    return teeth, lengths, distances
@@ -0,0 +1,61 @@
+import os
+
+from modules.logger_setup import logger
+from modules.storage import get_backend
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+def list_migrations(migrations_dir):
+    '''Returns the sorted list of (name, path) for every .sql migration'''
+    names = sorted(f for f in os.listdir(migrations_dir) if f.endswith(".sql"))
+    return [(os.path.splitext(name)[0], os.path.join(migrations_dir, name)) for name in names]
+
+
+# -------------------------------------------
+# APPLY PENDING SCHEMA MIGRATIONS
+# -------------------------------------------
+def apply_migrations():
+    '''Brings the schema of the configured storage backend up to date'''
+    return get_backend().apply_migrations()
+
+
+def apply_sql_migrations(backend, migrations_dir=None, conn=None):
+    """
+    Run every migration of `backend` (migrations/<backend.name>/*.sql) not
+    yet recorded in schema_migrations, in order. Each script runs in its own
+    transaction together with its bookkeeping row.
+    """
+    migrations_dir = migrations_dir or os.path.join(MIGRATIONS_DIR, backend.name)
+    own_conn = conn is None
+    if own_conn:
+        conn = backend.connect()
+    cur = conn.cursor()
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name TEXT PRIMARY KEY,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    cur.execute("SELECT name FROM schema_migrations;")
+    applied = {row[0] for row in cur.fetchall()}
+    cur.close()
+    conn.commit()
+
+    newly_applied = []
+    try:
+        for name, path in list_migrations(migrations_dir):
+            if name in applied:
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                script = f.read()
+
+            if not backend.run_migration(conn, name, script):
+                continue # Another process applied it since the check above
+            logger.info("Applied migration %s", name)
+            newly_applied.append(name)
+    finally:
+        if own_conn:
+            conn.close()
+    return newly_applied
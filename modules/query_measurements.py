@@ -0,0 +1,112 @@
+from modules.storage import get_backend
+
+# Columns returned by the query API (never the image blob or the label text)
+RESULT_COLUMNS = [
+    "id",
+    "title",
+    "sex",
+    "age",
+    "canine_13_length",
+    "canine_23_length",
+    "canine_33_length",
+    "canine_43_length",
+    "distance_13_23",
+    "distance_33_43",
+]
+
+# Columns that accept a (min, max) range filter
+MEASUREMENT_COLUMNS = RESULT_COLUMNS[4:]
+
+DEFAULT_PAGE_SIZE = 500
+
+
+def _build_filters(backend, sex=None, age_min=None, age_max=None, title_pattern=None, ranges=None):
+    '''Returns (list of SQL conditions, list of parameters) for the given filters'''
+    p = backend.placeholder
+    conditions = []
+    params = []
+
+    if sex is not None:
+        conditions.append(f"sex = {p}")
+        params.append(str(sex).strip().upper())
+    if age_min is not None:
+        conditions.append(f"age >= {p}")
+        params.append(age_min)
+    if age_max is not None:
+        conditions.append(f"age <= {p}")
+        params.append(age_max)
+    if title_pattern:
+        # SQL LIKE syntax (% and _), case insensitive
+        conditions.append(f"title {backend.ilike} {p}")
+        params.append(title_pattern)
+
+    for column, (low, high) in (ranges or {}).items():
+        if column not in MEASUREMENT_COLUMNS:
+            raise ValueError(
+                f"Unknown measurement column '{column}'. "
+                f"Expected one of: {', '.join(MEASUREMENT_COLUMNS)}"
+            )
+        # Column names are checked against MEASUREMENT_COLUMNS above, so they are safe to inline
+        if low is not None:
+            conditions.append(f"{column} >= {p}")
+            params.append(low)
+        if high is not None:
+            conditions.append(f"{column} <= {p}")
+            params.append(high)
+
+    return conditions, params
+
+
+# -------------------------------------------
+# FETCH ONE PAGE OF MEASUREMENTS (KEYSET)
+# -------------------------------------------
+def query_measurements(sex=None, age_min=None, age_max=None, title_pattern=None,
+                       ranges=None, after_id=None, limit=DEFAULT_PAGE_SIZE, conn=None):
+    """
+    Return up to `limit` rows (as dicts of RESULT_COLUMNS) ordered by id.
+
+    Pass the id of the last row as `after_id` to get the next page; an empty
+    list means there are no more rows. `ranges` maps a measurement column to a
+    (min, max) tuple where either bound may be None.
+    """
+    backend = get_backend()
+    conditions, params = _build_filters(backend, sex, age_min, age_max, title_pattern, ranges)
+    if after_id is not None:
+        conditions.append(f"id > {backend.placeholder}")
+        params.append(after_id)
+
+    query = f"SELECT {', '.join(RESULT_COLUMNS)} FROM OPGs"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY id LIMIT {backend.placeholder}"
+    params.append(int(limit))
+
+    own_conn = conn is None
+    if own_conn:
+        conn = backend.connect()
+    try:
+        cur = conn.cursor()
+        cur.execute(query, params)
+        rows = [dict(zip(RESULT_COLUMNS, row)) for row in cur.fetchall()]
+        cur.close()
+    finally:
+        if own_conn:
+            conn.close()
+    return rows
+
+
+# -------------------------------------------
+# ITERATE OVER ALL MATCHING MEASUREMENTS
+# -------------------------------------------
+def iter_measurements(page_size=DEFAULT_PAGE_SIZE, after_id=None, **filters):
+    '''Yields every matching row, fetching one keyset page at a time over a single connection'''
+    conn = get_backend().connect()
+    try:
+        while True:
+            page = query_measurements(after_id=after_id, limit=page_size, conn=conn, **filters)
+            if not page:
+                break
+            yield from page
+            after_id = page[-1]["id"]
+    finally:
+        conn.close()
@@ -0,0 +1,184 @@
+import os
+from collections import deque
+from functools import partial
+
+from modules.logger_setup import logger, setup_logging
+from modules.query_measurements import MEASUREMENT_COLUMNS
+from modules.storage import get_backend
+
+DEFAULT_BATCH_SIZE = 200
+
+# Bytes of opg_image fetched to read the image size during the backfill
+IMAGE_HEAD_BYTES = 64 * 1024
+
+# Compact tooth set columns, always rewritten from label_text
+TOOTH_COLUMNS = ["tooth_set", "tooth_lengths", "peak_distances"]
+
+
+def update_columns(class_map):
+    '''Columns derived from label_text: the legacy canine columns the tooth set covers + TOOTH_COLUMNS'''
+    from modules.tooth_config import canine_columns
+
+    return canine_columns(class_map.values()) + TOOTH_COLUMNS
+
+
+def _init_worker():
+    # Forked workers inherit the parent's handlers (including logs/app.log, opened with mode="w");
+    # drop them so workers log to the console only and the parent stays the file's only writer
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    setup_logging(log_file=None)
+
+
+# -------------------------------------------
+# RECOMPUTE ONE BATCH (RUNS IN A WORKER)
+# -------------------------------------------
+def measure_rows(rows, class_map=None):
+    '''Takes (id, title, label_text, image_width, image_height) rows and returns (id, *update_columns(class_map)) rows'''
+    from modules.load_yolo_polygons import parse_yolo_polygons
+    from modules.measure_opg import measure_opg, measurement_values, packed_measurements
+    from modules.tooth_config import canine_columns, load_class_map
+
+    class_map = class_map or load_class_map()
+    columns = canine_columns(class_map.values())
+
+    results = []
+    for row_id, title, label_text, image_width, image_height in rows:
+        try:
+            polygons = parse_yolo_polygons((label_text or "").splitlines(), title, class_map)
+            measurements = measure_opg(polygons, image_width, image_height)
+        except Exception as e:
+            logger.error(f"❌ Could not remeasure {title}: {e}")
+            continue
+        values = measurement_values(measurements)
+        results.append((row_id, *[values[c] for c in columns], *packed_measurements(measurements)))
+    return results
+
+
+def _map_bounded(pool, fn, batches, max_pending):
+    '''Like pool.map, but only keeps max_pending batches in flight so rows keep streaming'''
+    pending = deque()
+    for batch in batches:
+        pending.append(pool.submit(fn, batch))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# -------------------------------------------
+# REMEASURE EVERY STORED OPG
+# -------------------------------------------
+def remeasure_all(workers=None, batch_size=DEFAULT_BATCH_SIZE, class_map=None):
+    """
+    Recompute measurements from the stored labels and image dimensions.
+
+    Rows are streamed in batches (opg_image is never read), measured in a
+    process pool and written back one batch per transaction over a single
+    write connection.
+    Returns (updated, skipped) row counts.
+    """
+    from concurrent.futures import ProcessPoolExecutor # Pulls in multiprocessing, so only on use
+    from modules.tooth_config import load_class_map
+
+    class_map = class_map or load_class_map()
+    columns = update_columns(class_map)
+    untouched = [c for c in MEASUREMENT_COLUMNS if c not in columns]
+    if untouched:
+        logger.warning(
+            f"⚠ The tooth set lacks the teeth for {', '.join(untouched)}; "
+            "those columns keep their stored values."
+        )
+    backend = get_backend()
+
+    conn = backend.connect() # Write connection, reused for every batch
+    try:
+        backend.require_columns(["image_width", "image_height"] + columns, conn)
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM OPGs WHERE image_width IS NULL OR image_height IS NULL;")
+        skipped = cur.fetchone()[0]
+        cur.close()
+        conn.commit()
+        if skipped:
+            logger.warning(
+                f"⚠ {skipped} rows have no stored image dimensions and will be skipped; "
+                "run with --backfill-dimensions first."
+            )
+
+        batches = backend.iter_batches(
+            """
+            SELECT id, title, label_text, image_width, image_height
+            FROM OPGs
+            WHERE image_width IS NOT NULL AND image_height IS NOT NULL
+            ORDER BY id;
+            """,
+            batch_size=batch_size,
+        )
+
+        workers = workers or os.cpu_count() or 1
+        updated = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            measure = partial(measure_rows, class_map=class_map)
+            for results in _map_bounded(pool, measure, batches, max_pending=2 * workers):
+                if results:
+                    backend.update_opg_columns(columns, results, conn)
+                    updated += len(results)
+                    logger.info(f"✔ Remeasured {updated} OPGs")
+    finally:
+        conn.close()
+
+    return updated, skipped
+
+
+# -------------------------------------------
+# FILL IN MISSING IMAGE DIMENSIONS (ONE-OFF)
+# -------------------------------------------
+def _image_size(conn, placeholder, row_id, head):
+    '''Size from the first bytes of an image; falls back to the full blob if the header is further in'''
+    from io import BytesIO
+    from PIL import Image
+
+    try:
+        return Image.open(BytesIO(bytes(head))).size
+    except Exception:
+        cur = conn.cursor()
+        cur.execute(f"SELECT opg_image FROM OPGs WHERE id = {placeholder}", (row_id,))
+        image = cur.fetchone()[0]
+        cur.close()
+        return Image.open(BytesIO(bytes(image))).size
+
+
+def backfill_image_dimensions(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Store width/height for rows without them. Only the first
+    IMAGE_HEAD_BYTES of each opg_image are transferred, which covers the
+    JPEG/PNG header unless it sits behind a large EXIF block; such rows
+    fall back to fetching the whole blob.
+    """
+    backend = get_backend()
+    backend.require_columns(["image_width", "image_height"])
+    batches = backend.iter_batches(
+        f"""
+        SELECT id, substr(opg_image, 1, {IMAGE_HEAD_BYTES}) FROM OPGs
+        WHERE (image_width IS NULL OR image_height IS NULL) AND opg_image IS NOT NULL
+        ORDER BY id;
+        """,
+        batch_size=batch_size,
+    )
+
+    filled = 0
+    conn = backend.connect() # Write connection, reused for every batch
+    try:
+        for rows in batches:
+            sizes = []
+            for row_id, head in rows:
+                width, height = _image_size(conn, backend.placeholder, row_id, head)
+                sizes.append((row_id, width, height))
+            if sizes:
+                backend.update_opg_columns(["image_width", "image_height"], sizes, conn)
+                filled += len(sizes)
+                logger.info(f"✔ Stored dimensions for {filled} OPGs")
+    finally:
+        conn.close()
+
+    return filled
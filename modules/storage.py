@@ -0,0 +1,394 @@
+import os
+
+_config_loaded = False
+_backend = None
+
+# Columns ingest may write (title is the conflict key); records carry a subset
+OPG_COLUMNS = [
+    "title", "sex", "age",
+    "canine_13_length", "canine_23_length",
+    "canine_33_length", "canine_43_length",
+    "distance_13_23", "distance_33_43",
+    "opg_image", "label_text",
+    "image_width", "image_height",
+    "tooth_set", "tooth_lengths", "peak_distances",
+]
+
+DEFAULT_SQLITE_PATH = os.path.join("data", "opgs.sqlite3")
+
+
+# -------------------------------------------
+# CONFIG
+# -------------------------------------------
+def load_config():
+    '''Load the environmental variables from .env (only once per process)'''
+    global _config_loaded
+    if _config_loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _config_loaded = True
+
+
+def _upsert_sql(placeholder, columns):
+    values = ", ".join([placeholder] * len(columns))
+    updates = ",\n            ".join(f"{c} = EXCLUDED.{c}" for c in columns if c != "title")
+    return f"""
+        INSERT INTO OPGs ({", ".join(columns)})
+        VALUES ({values})
+        ON CONFLICT (title) DO UPDATE SET
+            {updates};
+    """
+
+
+def _group_by_columns(records):
+    '''Splits {column: value} records into (columns, value tuples) groups sharing the same keys'''
+    groups = {}
+    for record in records:
+        groups.setdefault(tuple(record), []).append(tuple(record.values()))
+    return groups.items()
+
+
+def _quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+# -------------------------------------------
+# STORAGE BACKEND INTERFACE
+# -------------------------------------------
+class StorageBackend:
+    """
+    Where OPG records live. Connections are plain DB-API connections, so
+    callers can run portable SQL written with `placeholder` and `ilike`.
+    """
+
+    name = None
+    placeholder = "%s"  # DB-API parameter marker
+    ilike = "ILIKE"     # Case-insensitive LIKE operator
+
+    def __init__(self):
+        self._checked_columns = set()
+
+    def connect(self):
+        raise NotImplementedError
+
+    def apply_migrations(self):
+        '''Runs the pending migrations/<name>/*.sql scripts; returns the names of the applied ones'''
+        from modules.migrations import apply_sql_migrations
+
+        return apply_sql_migrations(self)
+
+    def run_migration(self, conn, name, script):
+        '''Runs one migration script and records it in schema_migrations, in a single transaction; returns True'''
+        cur = conn.cursor()
+        cur.execute(script)
+        cur.execute(f"INSERT INTO schema_migrations (name) VALUES ({self.placeholder});", (name,))
+        conn.commit()
+        cur.close()
+        return True
+
+    def require_columns(self, columns, conn=None):
+        """
+        Raise a RuntimeError naming the missing columns if OPGs lacks any of
+        `columns` (i.e. migrate.py has not been run). Columns found once are
+        not checked again.
+        """
+        wanted = set(columns) - self._checked_columns
+        if not wanted:
+            return
+        own_conn = conn is None
+        if own_conn:
+            conn = self.connect()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT * FROM OPGs LIMIT 0") # Reads the column list only
+            existing = {desc[0].lower() for desc in cur.description}
+            cur.close()
+            if own_conn:
+                conn.commit() # Ends the read transaction (PostgreSQL)
+        finally:
+            if own_conn:
+                conn.close()
+
+        missing = sorted(c for c in wanted if c.lower() not in existing)
+        if missing:
+            raise RuntimeError(
+                f"Table OPGs is missing column(s) {', '.join(missing)}; "
+                "run `python migrate.py` to update the database schema."
+            )
+        self._checked_columns |= wanted
+
+    def upsert_opg_records(self, records):
+        """
+        Insert or update (on title) {column: value} records in one
+        transaction. Only the columns present in a record are written, so
+        columns a record leaves out keep their stored values.
+        """
+        if not records:
+            return
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            for columns, rows in _group_by_columns(records):
+                self.require_columns(columns, conn)
+                self._executemany(cur, _upsert_sql(self.placeholder, columns), rows)
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+
+    def fetch_table(self, table_name):
+        '''Returns (columns, rows) for every row of a table'''
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            cur.execute(self._select_all_sql(table_name))
+            rows = cur.fetchall()
+            columns = [desc[0] for desc in cur.description]
+            cur.close()
+        finally:
+            conn.close()
+        return columns, rows
+
+    def _select_all_sql(self, table_name):
+        return f"SELECT * FROM {_quote_identifier(table_name)}"
+
+    def _open_stream_cursor(self, conn, batch_size):
+        return conn.cursor()
+
+    def iter_batches(self, query, params=(), batch_size=500):
+        '''Yields lists of rows for a SELECT without loading the whole result at once'''
+        conn = self.connect()
+        try:
+            cur = self._open_stream_cursor(conn, batch_size)
+            cur.execute(query, params)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+            cur.close()
+        finally:
+            conn.close()
+
+    def update_opg_columns(self, columns, rows, conn=None):
+        """
+        Bulk-update `columns` of OPGs from (id, *values) rows in one
+        transaction. Pass `conn` to reuse one write connection across
+        batches; it is committed but left open.
+        """
+        if not rows:
+            return
+        assignments = ", ".join(f"{c} = {self.placeholder}" for c in columns)
+        query = f"UPDATE OPGs SET {assignments} WHERE id = {self.placeholder}"
+        params = [(*row[1:], row[0]) for row in rows]
+        own_conn = conn is None
+        if own_conn:
+            conn = self.connect()
+        try:
+            cur = conn.cursor()
+            self._executemany(cur, query, params)
+            conn.commit()
+            cur.close()
+        finally:
+            if own_conn:
+                conn.close()
+
+    def _executemany(self, cur, query, params):
+        cur.executemany(query, params)
+
+
+# -------------------------------------------
+# POSTGRESQL (configured from .env)
+# -------------------------------------------
+class PostgresBackend(StorageBackend):
+    name = "postgres"
+
+    def __init__(self):
+        super().__init__()
+        self._types = None
+
+    def connect(self):
+        import psycopg2
+
+        load_config()
+        return psycopg2.connect(
+            dbname = os.getenv("DB_NAME"),
+            user = os.getenv("DB_USER"),
+            password = os.getenv("DB_PASSWORD"),
+            host = os.getenv("DB_HOST"),
+            port = os.getenv("DB_PORT"),
+        )
+
+    def _select_all_sql(self, table_name):
+        from psycopg2 import sql
+
+        return sql.SQL("SELECT * FROM {}").format(sql.Identifier(table_name))
+
+    def _open_stream_cursor(self, conn, batch_size):
+        # Named cursor = server-side cursor, rows arrive in batches instead of all at once
+        cur = conn.cursor(name="opgs_stream")
+        cur.itersize = batch_size
+        return cur
+
+    def _executemany(self, cur, query, params):
+        from psycopg2.extras import execute_batch
+
+        execute_batch(cur, query, params, page_size=len(params))
+
+    def _column_types(self, conn):
+        '''{column: SQL type} of OPGs, read from the catalog once per backend'''
+        if self._types is None:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT attname, format_type(atttypid, atttypmod)
+                FROM pg_attribute
+                WHERE attrelid = 'opgs'::regclass AND attnum > 0 AND NOT attisdropped;
+            """)
+            self._types = dict(cur.fetchall())
+            cur.close()
+        return self._types
+
+    def update_opg_columns(self, columns, rows, conn=None):
+        # One UPDATE ... FROM (VALUES ...) per batch instead of one statement per row.
+        # VALUES are cast to the column types, otherwise an all-NULL column is typed as text.
+        if not rows:
+            return
+        from psycopg2.extras import execute_values
+
+        own_conn = conn is None
+        if own_conn:
+            conn = self.connect()
+        try:
+            types = self._column_types(conn)
+            template = "(" + ", ".join(f"%s::{types[c]}" for c in ["id", *columns]) + ")"
+            assignments = ", ".join(f"{c} = v.{c}" for c in columns)
+            cur = conn.cursor()
+            execute_values(
+                cur,
+                f"""
+                UPDATE OPGs AS o SET {assignments}
+                FROM (VALUES %s) AS v (id, {", ".join(columns)})
+                WHERE o.id = v.id;
+                """,
+                rows,
+                template=template,
+                page_size=len(rows),
+            )
+            conn.commit()
+            cur.close()
+        finally:
+            if own_conn:
+                conn.close()
+
+
+# -------------------------------------------
+# SQLITE (embedded, single file, no server)
+# -------------------------------------------
+class SQLiteBackend(StorageBackend):
+    name = "sqlite"
+    placeholder = "?"
+    ilike = "LIKE"  # SQLite LIKE is already case-insensitive for ASCII
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        super().__init__()
+        # Every connect() opens the file again, which for :memory: would be a new, empty database
+        if path == ":memory:" or str(path).startswith("file::memory:"):
+            raise ValueError("SQLiteBackend needs a database file; ':memory:' is not supported")
+        self.path = path
+        self._schema_ready = False
+
+    def _open(self):
+        import sqlite3
+
+        db_dir = os.path.dirname(self.path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL;")   # Readers don't block the writer
+        conn.execute("PRAGMA synchronous=NORMAL;") # Safe with WAL, far fewer fsyncs
+        return conn
+
+    def connect(self):
+        conn = self._open()
+        if not self._schema_ready:
+            # The embedded database migrates itself on first use (no separate migrate.py step)
+            from modules.migrations import apply_sql_migrations
+
+            try:
+                apply_sql_migrations(self, conn=conn)
+            except Exception:
+                conn.close()
+                raise
+            self._schema_ready = True
+        return conn
+
+    def apply_migrations(self):
+        # Skips the self-migration in connect() so the applied scripts are reported
+        from modules.migrations import apply_sql_migrations
+
+        conn = self._open()
+        try:
+            applied = apply_sql_migrations(self, conn=conn)
+        finally:
+            conn.close()
+        self._schema_ready = True
+        return applied
+
+    def run_migration(self, conn, name, script):
+        """
+        Apply one script under BEGIN IMMEDIATE, which takes the database
+        write lock up front. schema_migrations is re-read under the lock, so
+        when several processes open a fresh database at once only the first
+        one runs the script; returns False for the others.
+        """
+        import sqlite3
+
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            if conn.execute("SELECT 1 FROM schema_migrations WHERE name = ?;", (name,)).fetchone():
+                conn.rollback()
+                return False
+            # executescript() would commit first and drop the lock, so run statement by statement
+            statement = ""
+            for line in script.splitlines(keepends=True):
+                statement += line
+                if sqlite3.complete_statement(statement):
+                    conn.execute(statement)
+                    statement = ""
+            conn.execute("INSERT INTO schema_migrations (name) VALUES (?);", (name,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return True
+
+
+# -------------------------------------------
+# ACTIVE BACKEND
+# -------------------------------------------
+def get_backend():
+    """
+    Return the process-wide storage backend.
+
+    STORAGE_BACKEND selects it ("postgres", the default, or "sqlite");
+    SQLITE_PATH sets the database file for the embedded backend.
+    """
+    global _backend
+    if _backend is None:
+        load_config()
+        kind = os.getenv("STORAGE_BACKEND", "postgres").strip().lower()
+        if kind in ("postgres", "postgresql"):
+            _backend = PostgresBackend()
+        elif kind == "sqlite":
+            _backend = SQLiteBackend(os.getenv("SQLITE_PATH") or DEFAULT_SQLITE_PATH)
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND '{kind}'. Expected 'postgres' or 'sqlite'")
+    return _backend
+
+
+def set_backend(backend):
+    '''Overrides the configured backend (e.g. SQLiteBackend(path) for a benchmark run)'''
+    global _backend
+    _backend = backend
@@ -0,0 +1,66 @@
+import json
+import os
+import re
+
+# YOLO class id → FDI tooth number (the four canines, as labelled in our datasets)
+DEFAULT_CLASS_MAP = {"0": "13", "1": "23", "2": "33", "3": "43"}
+
+# Legacy per-canine columns of OPGs → the teeth each one is computed from
+CANINE_COLUMNS = {
+    "canine_13_length": ("13",),
+    "canine_23_length": ("23",),
+    "canine_33_length": ("33",),
+    "canine_43_length": ("43",),
+    "distance_13_23": ("13", "23"),
+    "distance_33_43": ("33", "43"),
+}
+
+# Permanent teeth use quadrants 1-4 with positions 1-8, deciduous teeth quadrants 5-8 with positions 1-5
+_FDI_PATTERN = re.compile(r"^([1-4][1-8]|[5-8][1-5])$")
+
+
+def is_maxillary(tooth):
+    '''Upper-jaw teeth (quadrants 1, 2, 5, 6) point down, so their peak is the bottom-most point'''
+    return str(tooth)[0] in "1256"
+
+
+def canine_columns(teeth):
+    '''Legacy canine columns a tooth set can fill; the others must be left untouched when storing'''
+    teeth = set(teeth)
+    return [column for column, needed in CANINE_COLUMNS.items() if teeth.issuperset(needed)]
+
+
+# -------------------------------------------
+# LOAD THE YOLO CLASS → FDI TOOTH MAP
+# -------------------------------------------
+def load_class_map(path=None):
+    """
+    Return the class map as {class_id: fdi_tooth}, ordered by class id.
+
+    The map is read from a JSON object such as {"0": "13", "1": "23", ...}
+    at `path`, or at the TOOTH_CLASS_MAP environment variable (.env is
+    honoured). Without either the four canines are used.
+    """
+    if path is None:
+        from modules.storage import load_config
+
+        load_config()
+        path = os.getenv("TOOTH_CLASS_MAP")
+    if not path:
+        return dict(DEFAULT_CLASS_MAP)
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    class_map = {}
+    for cls, tooth in raw.items():
+        cls, tooth = str(cls).strip(), str(tooth).strip()
+        if not cls.isdigit():
+            raise ValueError(f"Class map {path}: class id '{cls}' is not a number")
+        if not _FDI_PATTERN.match(tooth):
+            raise ValueError(f"Class map {path}: '{tooth}' is not an FDI tooth number")
+        if tooth in class_map.values():
+            raise ValueError(f"Class map {path}: tooth {tooth} is mapped more than once")
+        class_map[cls] = tooth
+
+    return dict(sorted(class_map.items(), key=lambda item: int(item[0])))
@@ -4,42 +4,28 @@ import numpy as np
 from modules.logger_setup import logger
 
 
-def _extreme_center(px, py, want_max, eps):
-    target = float(np.max(py) if want_max else np.min(py))
-    if want_max:
-        mask = py >= (target - eps)
-    else:
-        mask = py <= (target + eps)
-
-    if not np.any(mask):
-        idx = int(np.argmax(py) if want_max else np.argmin(py))
-        return float(px[idx]), target
-
-    x = float(np.mean(px[mask]))
-    return x, target
-
+def _vertical_extremes(polygons, image_width, image_height):
+    """Return {tooth: (top, bottom)} integer pixel points, same geometry as the measurements."""
+    from modules.measure_teeth import polygon_extremes
 
-def _vertical_extremes(points, image_width, image_height):
-    """Return pixel coordinates for the top and bottom points of a polygon."""
-    px = np.array([p[0] * image_width for p in points])
-    py = np.array([p[1] * image_height for p in points])
-
-    eps = 1.0  # pixels
-    top_x, top_y = _extreme_center(px, py, want_max=False, eps=eps)
-    bot_x, bot_y = _extreme_center(px, py, want_max=True, eps=eps)
-
-    top = (int(round(top_x)), int(round(top_y)))
-    bottom = (int(round(bot_x)), int(round(bot_y)))
-    return top, bottom
+    teeth = [t for t, pts in polygons.items() if pts]
+    top, bottom = polygon_extremes([polygons[t] for t in teeth], image_width, image_height)
+    return {
+        t: (_round_peak(top[i]), _round_peak(bottom[i]))
+        for i, t in enumerate(teeth)
+    }
 
 
 def _round_peak(pt):
     return (int(round(pt[0])), int(round(pt[1])))
 
 
-def visualize_measurements(image_path, polygons, peaks, output_dir="exports/visualizations"):
+def visualize_measurements(image_path, polygons, peaks, output_dir="exports/visualizations", image_bytes=None):
     """
     Draw canine length lines (orange) and inter-canine distance lines (red) on the image.
+
+    When image_bytes is given the image is decoded from memory and image_path
+    only names the output file.
     """
     try:
         import cv2
@@ -47,7 +33,10 @@ def visualize_measurements(image_path, polygons, peaks, output_dir="exports/visu
         logger.warning("OpenCV not installed; skipping visualization for %s", image_path)
         return None
 
-    img = cv2.imread(image_path)
+    if image_bytes is not None:
+        img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    else:
+        img = cv2.imread(image_path)
     if img is None:
         logger.warning("Could not read image for visualization: %s", image_path)
         return None
@@ -60,11 +49,8 @@ def visualize_measurements(image_path, polygons, peaks, output_dir="exports/visu
     distance_color = (0, 0, 255)  # Red (BGR)
     thickness = 2
 
-    # Draw canine length lines
-    for tooth, pts in polygons.items():
-        if not pts:
-            continue
-        top, bottom = _vertical_extremes(pts, image_width, image_height)
+    # Draw tooth length lines
+    for top, bottom in _vertical_extremes(polygons, image_width, image_height).values():
         img = cv2.line(img, top, bottom, length_color, thickness)
 
     # Draw inter-canine distance lines
@@ -0,0 +1,107 @@
+import argparse
+import csv
+import sys
+
+from modules.query_measurements import (
+    DEFAULT_PAGE_SIZE,
+    MEASUREMENT_COLUMNS,
+    RESULT_COLUMNS,
+    iter_measurements,
+    query_measurements,
+)
+
+
+def parse_range(text: str):
+    """Parse COLUMN=MIN:MAX (either bound may be empty) into (column, (min, max))."""
+    column, sep, bounds = text.partition("=")
+    low, colon, high = bounds.partition(":")
+    if not sep or not colon:
+        raise argparse.ArgumentTypeError(f"Expected COLUMN=MIN:MAX, got '{text}'")
+    column = column.strip()
+    if column not in MEASUREMENT_COLUMNS:
+        raise argparse.ArgumentTypeError(
+            f"Unknown measurement column '{column}'. Expected one of: {', '.join(MEASUREMENT_COLUMNS)}"
+        )
+    try:
+        return column, (float(low) if low.strip() else None, float(high) if high.strip() else None)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Range bounds must be numbers, got '{text}'")
+
+
+# ------------------------------
+# Entry point
+# ------------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Query stored OPG measurements (without image data) and write them as CSV."
+    )
+    parser.add_argument("--sex", choices=["B", "F"], type=str.upper, help="Filter by sex (B or F)")
+    parser.add_argument("--age-min", type=int, help="Minimum age (inclusive)")
+    parser.add_argument("--age-max", type=int, help="Maximum age (inclusive)")
+    parser.add_argument(
+        "--title",
+        help="Case-insensitive SQL LIKE pattern on the title, e.g. '%%-B-%%'",
+    )
+    parser.add_argument(
+        "--range",
+        dest="ranges",
+        action="append",
+        type=parse_range,
+        default=[],
+        metavar="COLUMN=MIN:MAX",
+        help="Measurement range filter, repeatable (e.g. canine_13_length=20:30 or distance_13_23=:40)",
+    )
+    parser.add_argument(
+        "--after-id",
+        type=int,
+        help="Keyset cursor: only return rows with an id greater than this",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Page size (default: {DEFAULT_PAGE_SIZE})",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Page through every matching row instead of returning a single page",
+    )
+    parser.add_argument(
+        "--output",
+        help="Output .csv path (default: stdout)",
+    )
+    args = parser.parse_args()
+
+    filters = dict(
+        sex=args.sex,
+        age_min=args.age_min,
+        age_max=args.age_max,
+        title_pattern=args.title,
+        ranges=dict(args.ranges),
+    )
+    if args.all:
+        rows = iter_measurements(page_size=args.limit, after_id=args.after_id, **filters)
+    else:
+        rows = query_measurements(after_id=args.after_id, limit=args.limit, **filters)
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        count = 0
+        last_id = None
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            last_id = row["id"]
+    finally:
+        if args.output:
+            out.close()
+
+    # Report the cursor on stderr so stdout stays valid CSV
+    print(f"Returned {count} rows; last id: {last_id}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
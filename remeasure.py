@@ -0,0 +1,53 @@
+import argparse
+
+from modules.logger_setup import logger, setup_logging
+from modules.remeasure import DEFAULT_BATCH_SIZE, backfill_image_dimensions, remeasure_all
+from modules.tooth_config import load_class_map
+
+
+# ------------------------------
+# Entry point
+# ------------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recompute stored OPG measurements from label_text without reading image files."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per fetch/update batch (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--class-map",
+        help="JSON file mapping YOLO class ids to FDI teeth (default: TOOTH_CLASS_MAP or the four canines)",
+    )
+    parser.add_argument(
+        "--backfill-dimensions",
+        action="store_true",
+        help="First store image_width/image_height for rows missing them (fetches the first 64 KiB of each image).",
+    )
+    args = parser.parse_args()
+
+    setup_logging(mode="a")
+
+    if args.backfill_dimensions:
+        filled = backfill_image_dimensions(batch_size=args.batch_size)
+        logger.info(f"📐 Stored image dimensions for {filled} OPGs.")
+
+    updated, skipped = remeasure_all(
+        workers=args.workers,
+        batch_size=args.batch_size,
+        class_map=load_class_map(args.class_map),
+    )
+    logger.info(f"\n🎉 DONE! Remeasured {updated} OPGs ({skipped} skipped without dimensions).\n")
+
+
+if __name__ == "__main__":
+    main()